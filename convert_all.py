@@ -0,0 +1,323 @@
+#!/usr/bin/env python3
+"""
+Convert GADM GeoPackage to per-country GeoParquet and/or GeoJSON files.
+
+Fuses the former convert_gadm.py and convert_to_geojson.py pipelines so the
+multi-GB GeoPackage read and the geometry simplification happen exactly once,
+with each country then written in whichever output formats were requested.
+"""
+
+import argparse
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+import warnings
+warnings.filterwarnings('ignore')
+
+import geopandas as gpd
+import numpy as np
+import orjson
+import pandas as pd
+import pyogrio
+import shapely
+
+# Copy-on-Write makes slices safe to assign into without eager .copy() -
+# only the columns actually written get duplicated (module level so worker
+# processes pick it up on import too)
+pd.set_option("mode.copy_on_write", True)
+
+from gadm_common import (
+    COLUMNS_TO_KEEP,
+    INPUT_FILE,
+    LEVEL_COLS,
+    OUTPUT_DIR,
+    SIMPLIFY_TOLERANCE,
+    get_admin_levels,
+    sanitize_filename,
+    valid_level_masks,
+    CountriesJsonWriter,
+)
+
+def walk_size(path):
+    """Total size in bytes of all files under path.
+
+    Uses os.scandir so sizes come from the DirEntry stat cache - half the
+    syscalls of os.walk plus os.path.getsize per file.
+    """
+    total = 0
+    for entry in os.scandir(path):
+        total += walk_size(entry.path) if entry.is_dir() else entry.stat().st_size
+    return total
+
+def write_parquet(country, country_gdf):
+    """Write one country's GeoParquet file; returns (filename, file_size)."""
+    filename = sanitize_filename(country) + ".parquet"
+    filepath = os.path.join(OUTPUT_DIR, filename)
+    # zstd compresses noticeably tighter than the default snappy, and small
+    # row groups plus the covering bbox column let browser-side readers do
+    # range reads and spatial predicate pushdown without decoding geometries
+    with open(filepath, 'wb') as f:
+        country_gdf.to_parquet(
+            f,
+            compression='zstd',
+            compression_level=3,
+            row_group_size=10000,
+            geometry_encoding='WKB',
+            schema_version='1.1.0',
+            write_covering_bbox=True
+        )
+        # fstat the handle we already hold instead of re-stat-ing the path
+        file_size = os.fstat(f.fileno()).st_size
+    return filename, file_size
+
+def write_geojson_levels(country, country_gdf, valid_masks):
+    """Write one country's per-level GeoJSON files; returns the levels written."""
+    # Create country directory
+    country_dir = os.path.join(OUTPUT_DIR, sanitize_filename(country))
+    os.makedirs(country_dir, exist_ok=True)
+
+    admin_levels = []
+
+    # frozenset gives O(1) column-membership checks in the level loop
+    cols = frozenset(country_gdf.columns)
+
+    for level, (name_col, type_col, engtype_col, gid_col) in LEVEL_COLS.items():
+        if level not in valid_masks.columns:
+            continue
+
+        # Check if this level has data - a precomputed bitmap slice, no
+        # per-level string comparisons here
+        has_data = valid_masks[level]
+        if not has_data.any():
+            continue
+
+        admin_levels.append(level)
+
+        # Filter rows that have data at this level
+        level_gdf = country_gdf[has_data]
+
+        # Dissolve by the admin level to get unique regions
+        # Group by name and other attributes at this level
+        group_cols = [name_col]
+        if type_col in cols:
+            group_cols.append(type_col)
+        if engtype_col in cols:
+            group_cols.append(engtype_col)
+        if gid_col in cols:
+            group_cols.append(gid_col)
+
+        # Add parent column if level > 1
+        parent_col = LEVEL_COLS[level - 1][0] if level > 1 else None
+        if parent_col and parent_col in cols:
+            group_cols.append(parent_col)
+
+        # Also keep NAME_0 (country name)
+        if 'NAME_0' in cols and 'NAME_0' not in group_cols:
+            group_cols.append('NAME_0')
+
+        # Dissolve without going through GeoDataFrame.dissolve: factorize the
+        # multi-column key to integer codes, group row indices with numpy, and
+        # union each group's geometries directly in GEOS. The key determines
+        # the attribute columns, so taking each group's first row is exact,
+        # and the data never leaves flat column arrays - no per-group frame
+        # reassembly. The coverage union is valid (and much faster than unary
+        # union) because GADM admin units tile without overlap by construction.
+        codes = pd.MultiIndex.from_frame(level_gdf[group_cols]).factorize()[0]
+        geoms = np.asarray(level_gdf.geometry.values)
+
+        order = np.argsort(codes, kind='stable')
+        sorted_codes = codes[order]
+        starts = np.flatnonzero(np.r_[True, sorted_codes[1:] != sorted_codes[:-1]])
+        ends = np.r_[starts[1:], len(order)]
+        first_rows = order[starts]
+
+        try:
+            merged = [shapely.coverage_union_all(geoms[order[s:e]])
+                      for s, e in zip(starts, ends)]
+        except Exception as e:
+            print(f"  Warning: Could not dissolve {country} level {level}: {e}")
+            merged = geoms
+            first_rows = np.arange(len(level_gdf))
+
+        # Create feature collection from plain column arrays; the geometries
+        # are serialized in one vectorized GEOS call instead of per-row
+        def column(col):
+            if not col or col not in cols:
+                return None
+            return level_gdf[col].to_numpy()[first_rows]
+
+        names = column(name_col)
+        country_names = column('NAME_0')
+        types = column(type_col)
+        engtypes = column(engtype_col)
+        gids = column(gid_col)
+        parents = column(parent_col)
+        geoms_json = shapely.to_geojson(merged)
+
+        def iter_features():
+            for i, geom_json in enumerate(geoms_json):
+                props = {
+                    'name': names[i] if names is not None else '',
+                    'country': country_names[i] if country_names is not None else country,
+                    'level': level
+                }
+
+                if types is not None and types[i]:
+                    props['type'] = types[i]
+                if engtypes is not None and engtypes[i]:
+                    props['eng_type'] = engtypes[i]
+                if gids is not None and gids[i]:
+                    props['gid'] = gids[i]
+                if parents is not None and parents[i]:
+                    props['parent'] = parents[i]
+
+                yield {
+                    'type': 'Feature',
+                    'properties': props,
+                    # Fragment embeds the ready-made JSON without re-encoding
+                    'geometry': orjson.Fragment(geom_json)
+                }
+
+        # Stream the FeatureCollection feature by feature instead of holding
+        # the full feature list plus one serialized buffer in memory at once
+        filename = f"level_{level}.geojson"
+        filepath = os.path.join(country_dir, filename)
+        with open(filepath, 'wb') as f:
+            f.write(b'{"type":"FeatureCollection","features":[')
+            first = True
+            for feature in iter_features():
+                if not first:
+                    f.write(b',')
+                f.write(orjson.dumps(feature))
+                first = False
+            f.write(b']}')
+
+    return admin_levels
+
+def process_country(country, country_gdf, valid_masks, bounds, formats):
+    """Write one country in the requested formats and return its metadata entry.
+
+    Returns None if only GeoJSON was requested and no admin level has data.
+    """
+    meta = {
+        "name": country,
+        "bounds": [float(bounds[0]), float(bounds[1]), float(bounds[2]), float(bounds[3])],
+        "record_count": len(country_gdf),
+    }
+
+    # When both formats are requested, run the parquet write on a thread so
+    # its I/O (pyarrow releases the GIL) overlaps the dissolve/serialize work
+    parquet_future = None
+    if 'parquet' in formats and 'geojson' in formats:
+        writer = ThreadPoolExecutor(max_workers=1)
+        parquet_future = writer.submit(write_parquet, country, country_gdf)
+
+    if 'geojson' in formats:
+        meta["folder"] = sanitize_filename(country)
+        meta["admin_levels"] = write_geojson_levels(country, country_gdf, valid_masks)
+    else:
+        meta["admin_levels"] = get_admin_levels(valid_masks)
+
+    if parquet_future is not None:
+        meta["filename"], meta["file_size"] = parquet_future.result()
+        writer.shutdown()
+    elif 'parquet' in formats:
+        meta["filename"], meta["file_size"] = write_parquet(country, country_gdf)
+    elif not meta["admin_levels"]:
+        return None
+
+    return meta
+
+def main(formats=('parquet', 'geojson')):
+    print("Loading GADM GeoPackage...")
+    print("This may take a few minutes due to file size...")
+
+    # Read the GeoPackage via pyogrio's Arrow batch path - columnar batches
+    # avoid per-record dict construction, and unused columns never materialize
+    gdf = pyogrio.read_dataframe(
+        INPUT_FILE,
+        layer='gadm_410',
+        columns=COLUMNS_TO_KEEP,
+        use_arrow=True
+    )
+    print(f"Loaded {len(gdf)} records")
+
+    # Ensure output directory exists
+    os.makedirs(OUTPUT_DIR, exist_ok=True)
+
+    # Simplify all geometries in one vectorized GEOS call instead of per-country
+    # GeoSeries calls. GADM admin units form a polygonal coverage, so
+    # coverage_simplify applies: it is linear in shared-edge count (vs the
+    # topology-preserving Douglas-Peucker path per polygon) and keeps shared
+    # borders snapped, so no slivers open up between neighbouring units
+    print("Simplifying geometries...")
+    gdf = gdf.set_geometry(gpd.GeoSeries(
+        shapely.coverage_simplify(gdf.geometry.values, SIMPLIFY_TOLERANCE),
+        crs=gdf.crs,
+        index=gdf.index
+    ))
+
+    # Compute the per-level "has data" masks once over the whole frame -
+    # O(5) column scans instead of O(countries x 5)
+    valid = valid_level_masks(gdf)
+
+    # Likewise compute every country's bounding box up front: one GEOS
+    # envelope pass over all geometries plus a vectorized groupby reduction,
+    # instead of a per-country total_bounds call in each worker
+    bounds_df = pd.DataFrame(
+        shapely.bounds(gdf.geometry.values),
+        columns=['minx', 'miny', 'maxx', 'maxy'],
+        index=gdf.index
+    )
+    country_bounds = bounds_df.groupby(gdf['COUNTRY'], sort=False, observed=True).agg(
+        {'minx': 'min', 'miny': 'min', 'maxx': 'max', 'maxy': 'max'}
+    )
+
+    # Partition by country once instead of boolean-scanning the frame per country
+    grouped = gdf.groupby('COUNTRY', sort=False, observed=True)
+    countries = sorted(grouped.groups.keys())
+    print(f"Processing {len(countries)} countries ({', '.join(formats)})...")
+
+    # Stream countries.json as results arrive rather than accumulating the
+    # full metadata list for one dump at the end
+    meta_writer = CountriesJsonWriter()
+
+    # One process per country slice - simplify/dissolve/serialize are CPU-bound,
+    # so processes scale where threads would serialize on the GIL
+    with ProcessPoolExecutor(max_workers=os.cpu_count()) as executor:
+        futures = {}
+        for country in countries:
+            country_gdf = grouped.get_group(country)
+            future = executor.submit(
+                process_country, country, country_gdf,
+                valid.loc[country_gdf.index],
+                country_bounds.loc[country].to_numpy(), formats
+            )
+            futures[future] = country
+
+        for i, future in enumerate(as_completed(futures)):
+            country = futures[future]
+            meta = future.result()
+            if meta is None:
+                print(f"[{i+1}/{len(countries)}] Skipping {country} - no admin levels found")
+                continue
+            meta_writer.add(meta)
+            print(f"[{i+1}/{len(countries)}] {country}: levels {meta['admin_levels']}")
+
+    meta_path = meta_writer.close()
+
+    print(f"\nDone! Processed {meta_writer.count} countries")
+    print(f"Metadata saved to {meta_path}")
+
+    # Calculate total size
+    print(f"Total data size: {walk_size(OUTPUT_DIR) / (1024*1024):.1f} MB")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        description="Convert GADM GeoPackage to per-country GeoParquet/GeoJSON files"
+    )
+    parser.add_argument(
+        '--formats', default='parquet,geojson',
+        help="Comma-separated output formats to write: parquet, geojson"
+    )
+    args = parser.parse_args()
+    main(tuple(f.strip() for f in args.formats.split(',') if f.strip()))
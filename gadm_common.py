@@ -0,0 +1,77 @@
+"""Shared configuration and helpers for the GADM conversion scripts."""
+
+import os
+
+import orjson
+import pandas as pd
+
+# Configuration
+INPUT_FILE = "../gadm.gpkg"
+OUTPUT_DIR = "data"
+SIMPLIFY_TOLERANCE = 0.001  # degrees (~100m at equator)
+
+# Attribute columns to keep (reduces file size; geometry is always read)
+COLUMNS_TO_KEEP = [
+    'UID', 'GID_0', 'NAME_0', 'COUNTRY',
+    'GID_1', 'NAME_1', 'TYPE_1', 'ENGTYPE_1',
+    'GID_2', 'NAME_2', 'TYPE_2', 'ENGTYPE_2',
+    'GID_3', 'NAME_3', 'TYPE_3', 'ENGTYPE_3',
+    'GID_4', 'NAME_4', 'TYPE_4', 'ENGTYPE_4',
+    'GID_5', 'NAME_5', 'TYPE_5', 'ENGTYPE_5',
+]
+
+# Per-level column names, precomputed so per-level loops do no f-string work
+LEVEL_COLS = {
+    level: (f'NAME_{level}', f'TYPE_{level}', f'ENGTYPE_{level}', f'GID_{level}')
+    for level in range(1, 6)
+}
+
+# Characters replaced with '_' in country names used as file/folder names
+_SANITIZE_TABLE = str.maketrans({' ': '_', '/': '_', '\\': '_', ':': '_', ',': '_'})
+
+def sanitize_filename(name):
+    """Convert country name to safe filename."""
+    return name.translate(_SANITIZE_TABLE)
+
+def valid_level_masks(gdf):
+    """Per-level "has data" boolean masks for the whole frame, keyed by level.
+
+    Computed once up front so the per-country work only slices bitmaps
+    instead of re-running notna/string comparisons per country per level.
+    """
+    return pd.DataFrame({
+        level: gdf[name_col].notna() & (gdf[name_col] != '')
+        for level, (name_col, _, _, _) in LEVEL_COLS.items()
+        if name_col in gdf.columns
+    })
+
+def get_admin_levels(valid_masks):
+    """Determine which admin levels have data, given one country's level masks."""
+    return [level for level in valid_masks.columns if valid_masks[level].any()]
+
+class CountriesJsonWriter:
+    """Incrementally writes the countries.json index consumed by the web app.
+
+    The driver appends each country's metadata from its as_completed loop,
+    so finished countries hit disk while the slowest ones (Russia, USA) are
+    still being processed instead of piling up for one dump at shutdown.
+    Entries appear in completion order.
+    """
+
+    def __init__(self):
+        self.path = os.path.join(OUTPUT_DIR, "countries.json")
+        self.count = 0
+        self._f = open(self.path, 'wb')
+        self._f.write(b'{"countries":[')
+
+    def add(self, meta):
+        if self.count:
+            self._f.write(b',')
+        self._f.write(orjson.dumps(meta))
+        self.count += 1
+
+    def close(self):
+        self._f.write(b'],"total_countries":%d,"simplify_tolerance":%s}'
+                      % (self.count, repr(SIMPLIFY_TOLERANCE).encode()))
+        self._f.close()
+        return self.path